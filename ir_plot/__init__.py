@@ -0,0 +1,9 @@
+"""
+Utility for the normalization and visualization of IR spectra from csv files
+"""
+
+from ir_plot.core import (import_and_normalize, import_irdata_from_csv, legacy_import_data, normalize_y,
+                          plot_spectrum, write_normalized_csv)
+
+__all__ = ["import_and_normalize", "import_irdata_from_csv", "legacy_import_data", "normalize_y", "plot_spectrum",
+           "write_normalized_csv"]
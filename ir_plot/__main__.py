@@ -0,0 +1,134 @@
+"""
+Tool to normalize and visualize IR spectra from csv files
+Takes the following arguments and flags:
+-x <start> <end> (optional): x limits for the plot. Type int. Default is 4000, 500.
+-y <start> <end> (optional): y limits for the plot. Type float. Default is automatic mode.
+<file>.csv: csv file with IR spectral data. The number is arbitrary.
+            If "*" is used, all csv files in the working directory are plotted
+--cache (optional): reuse/write the normalized data as <file>.npy next to each csv to skip parsing on reruns.
+--no-parallel (optional): parse the csv files one after another in the main process (e.g. for debugging).
+--single-figure (optional): plot all spectra as subplots of one figure instead of one figure per spectrum.
+--full-resolution (optional): plot every data point (e.g. for vector graphics export). By default long spectra are
+                              downsampled for faster drawing.
+--batch (optional): don't open any windows, save each plot as <file>.png instead (spectra.png with --single-figure).
+Set the environment variable IRPLOT_FAST_IO=arrow or IRPLOT_FAST_IO=polars to parse with pyarrow/polars (if installed).
+"""
+
+import argparse
+import itertools
+import os
+import sys
+
+import matplotlib
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from ir_plot.core import (cache_path, create_axes, iter_import_and_normalize, load_cache, plot_spectrum,
+                          write_normalized_csv)
+
+
+def main():
+    # deal with the arguments passed from command line
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-x", nargs=2, type=int, default=[4000, 500], metavar=("START", "END"),
+                        help="x limits for the plot (default: 4000 500)")
+    parser.add_argument("-y", nargs=2, type=float, default=[None, None], metavar=("START", "END"),
+                        help="y limits for the plot (default: automatic)")
+    parser.add_argument("--cache", action="store_true", help="reuse/write normalized data as <file>.npy")
+    parser.add_argument("--no-parallel", dest="parallel", action="store_false",
+                        help="parse the csv files one after another in the main process")
+    parser.add_argument("--single-figure", action="store_true", help="plot all spectra as subplots of one figure")
+    parser.add_argument("--full-resolution", action="store_true", help="plot every data point")
+    parser.add_argument("--batch", action="store_true", help="save plots as png instead of showing them")
+    parser.add_argument("files", nargs="+", help="csv files with IR data")
+    args = parser.parse_intermixed_args()  # allow flags between file names as before
+    print(sys.argv, "\n")
+    x_start, x_end = args.x
+    y_start, y_end = args.y
+    use_cache = args.cache
+    parallel = args.parallel
+    single_figure = args.single_figure
+    full_resolution = args.full_resolution
+    batch = args.batch
+    if batch:
+        matplotlib.use("Agg")  # no GUI windows and event loop needed when the plots are only saved
+    if full_resolution:
+        plt.rcParams["path.simplify"] = False  # draw every point, e.g. for vector graphics export
+
+    # Print some information to interactive output
+    print("Plotting all spectra with x limit {} to {}".format(x_start, x_end))
+    print("Plotting all spectra with y limit {} to {}\n".format(y_start, y_end))
+
+    # Process spectra in batch
+    cached = []  # files whose normalized data can be loaded from the cache
+    to_parse = []  # files that have to be imported and normalized
+    seen = set()  # to skip duplicate arguments
+    # sort all filenames given when this script was called
+    for file in args.files:
+        if not file.endswith(".csv"):
+            print("WARNING: Encountered invalid file type for {} (only .csv allowed). Skipping this file.".format(file))
+        elif file.endswith("_normalized.csv"):
+            print("Skipping previously processed file {}".format(file))
+        elif file in seen:
+            print("Skipping duplicate file {}".format(file))
+        else:
+            seen.add(file)
+            cachefile = cache_path(file)
+            if use_cache and os.path.exists(cachefile) and os.path.getmtime(cachefile) >= os.path.getmtime(file):
+                cached.append(file)
+            else:
+                to_parse.append(file)
+
+    # create all figures before the batch loop, so no figure is set up per spectrum
+    # (in batch mode without --single-figure each figure is created and closed per spectrum to keep memory flat)
+    save_per_file = batch and not single_figure
+    if save_per_file:
+        figures, axes = [], {}
+    else:
+        figures, axes = create_axes(len(cached) + len(to_parse), single_figure)
+        axes = dict(zip(cached + to_parse, axes))
+
+    # import and normalize Y values in one go, in worker processes unless --no-parallel was given
+    spectra = itertools.chain(((file, load_cache(file)) for file in cached),
+                              iter_import_and_normalize(to_parse, parallel))
+
+    # plotting has to stay in the main process, so it overlaps with the workers still parsing
+    for file, data in spectra:
+        if use_cache and file in to_parse:
+            np.save(cache_path(file), np.column_stack(data))
+        x, y = data
+        print("Normalized data for {}. Output:\n {}\n".format(file, pd.DataFrame({"X": x, "Y": y})))
+        # plot the spectra
+        axs = create_axes(1)[1][0] if save_per_file else axes[file]
+        plot_spectrum(x, y, file, x_start, x_end, y_start, y_end, axs, full_resolution)
+        print("Plotted spectra for {}.\n".format(file))
+        if save_per_file:
+            # save and release the figure right away, it won't be shown
+            fig = axs.figure
+            fig.tight_layout()
+            pngfile = os.path.splitext(file)[0] + ".png"
+            fig.savefig(pngfile, dpi=150)
+            plt.close(fig)
+            print("Saved plot to file {}".format(pngfile))
+        # save to csv
+        newfile = os.path.splitext(file)[0] + "_normalized.csv"
+        write_normalized_csv(newfile, x, y)
+        print("Saved normalized data to file {}".format(newfile))
+    if batch:
+        if single_figure and figures:
+            figures[0].tight_layout()
+            figures[0].savefig("spectra.png", dpi=150)
+            plt.close(figures[0])
+            print("Saved plot to file spectra.png")
+        print("All spectra processed. Exiting...")
+    else:
+        for fig in figures:
+            fig.tight_layout()  # once per figure instead of once per spectrum
+        print("All spectra processed. Exiting... (close all plots to exit)")
+        # ensure that all plots stay open
+        plt.show()
+
+
+if __name__ == '__main__':
+    main()
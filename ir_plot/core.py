@@ -0,0 +1,301 @@
+"""
+Functions to import, normalize and plot IR spectra from csv files
+"""
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import io
+import math
+import mmap
+import os
+import re
+
+try:
+    import numba
+except ImportError:  # numba is optional, normalization falls back to numpy
+    numba = None
+
+# CSV reader for the numeric block: "pandas" (default), "arrow" (needs pyarrow) or "polars" (needs polars)
+FAST_IO = os.environ.get("IRPLOT_FAST_IO", "pandas").lower()
+# spectra with more visible points than this are decimated to about PLOT_POINTS, the canvas can't show them anyway
+MAX_PLOT_POINTS = 4000
+PLOT_POINTS = 2000
+# plot decoration shared by all spectra
+XLABEL = r"wavenumber [$\mathregular{cm^{-1}]}$"  # matplotlib can interpret this LateX expression
+YLABEL = "transmission [a.u.]"
+
+
+def legacy_import_data(filename):
+    """
+    Read a csv, skipping the first 19 rows (metadata) and the last 40 rows (extended metadata)
+    FOR REFERENCE ONLY. USE DISCOURAGED DUE TO HARDCODED METADATA SLICING.
+    """
+    xydata = pd.read_csv(filename, engine="python", names=["X", "Y"], skiprows=19, skipfooter=40)
+    return xydata
+
+
+def import_irdata_from_csv(filename):
+    """
+    Read csv and identify start and end of dataset by "XYDATA" and "##### Extended Information" keywords
+    """
+    block_start, _, block_end = _find_data_block(filename)
+    # second pass: read only the numeric block straight into float64
+    xydata = _read_numeric_block(_read_bytes(filename, block_start, block_end))
+    return xydata
+
+
+def import_and_normalize(filename):
+    """
+    Read the IR data from a csv like import_irdata_from_csv and normalize Y to a maximum of 1 in place.
+    Returns X and Y as numpy.ndarrays (views on one float64 buffer) instead of a pandas.DataFrame.
+    """
+    block_start, data_end, block_end = _find_data_block(filename)
+    block = _read_bytes(filename, block_start, block_end)
+    data = None
+    if FAST_IO not in ("arrow", "polars"):
+        # np.loadtxt can't parse empty fields (e.g. the "," rows before the footer), pandas reads them as NaN
+        try:
+            data = np.loadtxt(block[:data_end - block_start].decode().splitlines(), delimiter=",",
+                              dtype=np.float64, ndmin=2)
+        except ValueError:
+            pass  # empty fields within the data, leave those to pandas
+    if data is None:
+        xy = _read_numeric_block(block).to_numpy()
+        if not xy.flags.writeable:
+            xy = xy.copy()  # pandas with copy-on-write hands out read-only views
+    else:
+        nnan = sum(1 for line in block[data_end - block_start:].splitlines() if line.strip())
+        if nnan:
+            xy = np.full((len(data) + nnan, 2), np.nan)
+            xy[:len(data)] = data
+        else:
+            xy = data
+    x, y = xy[:, 0], xy[:, 1]
+    _normalize(y)
+    return x, y
+
+
+def iter_import_and_normalize(filenames, parallel=True):
+    """
+    Yield (filename, (X, Y)) for every file as returned by import_and_normalize.
+    If parallel is True, the files are parsed in worker processes and yielded in order of completion.
+    """
+    if not parallel or len(filenames) < 2:
+        for filename in filenames:
+            print("Importing {}...".format(filename))
+            yield filename, import_and_normalize(filename)
+        return
+    with ProcessPoolExecutor(max_workers=min(len(filenames), os.cpu_count() or 1)) as executor:
+        futures = {}
+        for filename in filenames:
+            print("Importing {}...".format(filename))
+            futures[executor.submit(import_and_normalize, filename)] = filename
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+def cache_path(filename):
+    """
+    Return the path of the .npy file caching the normalized data of a csv file
+    """
+    return os.path.splitext(filename)[0] + ".npy"
+
+
+def load_cache(filename):
+    """
+    Load the normalized X and Y arrays of a csv file from its .npy cache (memory-mapped)
+    """
+    print("Loading cached data for {} from {}...".format(filename, cache_path(filename)))
+    xy = np.load(cache_path(filename), mmap_mode="r")
+    return xy[:, 0], xy[:, 1]
+
+
+if numba is not None:
+    @numba.njit("float64[:](float64[:])", cache=True)
+    def _normalize(y):
+        """
+        Divide y in place by its maximum (ignoring NaN) in one compiled loop
+        """
+        m = -np.inf
+        for i in range(y.shape[0]):
+            if y[i] > m:  # False for NaN, like np.nanmax
+                m = y[i]
+        for i in range(y.shape[0]):
+            y[i] /= m
+        return y
+else:
+    def _normalize(y):
+        """
+        Divide y in place by its maximum (ignoring NaN)
+        """
+        np.divide(y, np.nanmax(y), out=y)  # nanmax like pandas, the row before the footer is empty
+        return y
+
+
+def _find_data_block(filename):
+    """
+    Search the memory-mapped csv for the "XYDATA" and "##### Extended Information" keywords.
+    Returns the byte offsets of the first data row, of the empty rows (e.g. ",") at the end of the data
+    and of the Extended Information line.
+    """
+    with open(filename, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # the keywords are at the start of a line, so search including the preceding newline
+        start = mm.find(b"\nXYDATA")
+        end = mm.find(b"\n##### Extended Information", start + 1) if start != -1 else -1
+        if end == -1:
+            raise ValueError("Could not find XYDATA block in {}".format(filename))
+        block_start = mm.find(b"\n", start + 1) + 1  # first byte after the XYDATA line
+        block_end = end + 1  # first byte of the Extended Information line
+        # walk back over the empty rows right before the Extended Information line
+        data_end = block_end
+        while data_end > block_start:
+            previous = mm.rfind(b"\n", block_start - 1, data_end - 1) + 1  # start of the line before data_end
+            if mm[previous:data_end].strip(b"\r\n\t ,"):
+                break
+            data_end = previous
+    return block_start, data_end, block_end
+
+
+def _read_bytes(filename, start, end):
+    """
+    Read the bytes from offset start to end of a file
+    """
+    with open(filename, "rb") as f:
+        f.seek(start)
+        return f.read(end - start)
+
+
+def _read_numeric_block(block):
+    """
+    Read the bytes of the X,Y data block into a pandas.DataFrame with float64 "X" and "Y" columns.
+    Uses pyarrow or polars if requested via IRPLOT_FAST_IO and installed, else falls back to pandas.
+    """
+    if FAST_IO in ("arrow", "polars"):
+        try:
+            if FAST_IO == "arrow":
+                import pyarrow as pa
+                from pyarrow import csv
+                table = csv.read_csv(io.BytesIO(block),
+                                     read_options=csv.ReadOptions(column_names=["X", "Y"]),
+                                     convert_options=csv.ConvertOptions(column_types={"X": pa.float64(),
+                                                                                      "Y": pa.float64()}))
+                return table.to_pandas()
+            else:
+                import polars as pl
+                # polars reads empty lines as null rows, pandas skips them
+                block = re.sub(rb"(?m)^[ \t\r]*\n", b"", block)
+                dtypes = {"X": pl.Float64, "Y": pl.Float64}
+                try:
+                    table = pl.read_csv(io.BytesIO(block), has_header=False, new_columns=["X", "Y"],
+                                        schema_overrides=dtypes)
+                except TypeError:  # polars < 0.20.31 calls schema_overrides dtypes
+                    table = pl.read_csv(io.BytesIO(block), has_header=False, new_columns=["X", "Y"], dtypes=dtypes)
+                return table.to_pandas()
+        except ImportError:
+            print("WARNING: IRPLOT_FAST_IO={} requested but not installed. Falling back to pandas.".format(FAST_IO))
+    return pd.read_csv(io.BytesIO(block), names=["X", "Y"], header=None, dtype=np.float64, engine="c")
+
+
+def normalize_y(df):
+    """
+    Normalize the Y-values of pandas.DataFrame to a maximum of 1
+    """
+    y = df["Y"].to_numpy()
+    if y.flags.writeable:
+        _normalize(y)  # y is a view on the frame's float64 block, so this mutates df
+    else:
+        df["Y"] = y / np.nanmax(y)  # pandas with copy-on-write hands out read-only views
+    return df
+
+
+def create_axes(n, single_figure=False):
+    """
+    Create the axes for n spectra up front: one figure per spectrum, or one figure with a grid of n subplots
+    Returns the list of figures and the list of n axes.
+    """
+    if not single_figure:
+        figures, axes = [], []
+        for _ in range(n):
+            fig, axs = plt.subplots(1, 1)
+            figures.append(fig)
+            axes.append(axs)
+        return figures, axes
+    if n == 0:
+        return [], []
+    ncols = int(np.ceil(np.sqrt(n)))
+    nrows = int(np.ceil(n / ncols))
+    fig, axs = plt.subplots(nrows, ncols, squeeze=False)
+    for unused in axs.flat[n:]:
+        unused.set_visible(False)
+    return [fig], list(axs.flat[:n])
+
+
+def write_normalized_csv(filename, x, y):
+    """
+    Write X and Y arrays to a csv without header and index, formatted like pandas.DataFrame.to_csv
+    """
+    lines = ["{},{}\n".format(_format_value(xv), _format_value(yv)) for xv, yv in zip(x.tolist(), y.tolist())]
+    with open(filename, "w") as f:
+        f.write("".join(lines))
+
+
+def _decimate(x, y, xlim_start, xlim_end):
+    """
+    Keep the minimum and maximum of Y in buckets of consecutive points, so that bands survive the downsampling.
+    The bucket size is chosen to leave about PLOT_POINTS points between the x limits.
+    X and Y are returned unchanged if there are at most MAX_PLOT_POINTS points within the x limits.
+    """
+    if xlim_start is None or xlim_end is None:
+        visible = len(x)
+    else:
+        low, high = sorted((xlim_start, xlim_end))
+        visible = np.count_nonzero((x >= low) & (x <= high))
+    if visible <= MAX_PLOT_POINTS:
+        return x, y
+    bucket = 2 * visible // PLOT_POINTS  # two points (min and max) per bucket
+    nbuckets = len(y) // bucket
+    buckets = y[:nbuckets * bucket].reshape(nbuckets, bucket)
+    nan = np.isnan(buckets)  # ignore NaN unless the whole bucket is NaN
+    imin = np.where(nan, np.inf, buckets).argmin(axis=1)
+    imax = np.where(nan, -np.inf, buckets).argmax(axis=1)
+    # keep min and max in their original order within each bucket, and all points of the incomplete last bucket
+    indices = np.sort(np.column_stack((imin, imax)), axis=1) + bucket * np.arange(nbuckets)[:, np.newaxis]
+    indices = np.concatenate((indices.ravel(), np.arange(nbuckets * bucket, len(y))))
+    return x[indices], y[indices]
+
+
+def _format_value(value):
+    """
+    Format a float for the csv output, NaN is written as an empty field like pandas does
+    """
+    return "" if math.isnan(value) else repr(value)
+
+
+def plot_spectrum(x, y, filename, xlim_start, xlim_end, ylim_start, ylim_end, axs=None, full_resolution=False):
+    """
+    Plot an IR spectrum from X and Y arrays
+    Draws into axs if given (the caller is then responsible for the layout), else into a new figure.
+    Spectra with more than MAX_PLOT_POINTS points within the x limits are decimated unless full_resolution is True.
+    """
+    if not full_resolution:
+        x, y = _decimate(x, y, xlim_start, xlim_end)
+    if axs is None:
+        fig, axs = plt.subplots(1, 1)  # initialize a figure with one axis (since 1 row, 1 column)
+    else:
+        fig = None
+    axs.plot(x, y)  # plot the data
+    # cut the plot according to user input
+    axs.set_xlim(xlim_start, xlim_end)
+    axs.set_ylim(ylim_start, ylim_end)
+    # set informative labels
+    axs.set_xlabel(XLABEL)
+    axs.set_ylabel(YLABEL)
+    axs.grid(True)  # show a grid to help guide the viewer's eye
+    axs.set_title(os.path.basename(filename))  # set a title from the filename of the input data
+    if fig is not None:
+        fig.tight_layout()  # a standard option for matplotlib
+    if plt.get_backend().lower() != "agg":  # in batch mode savefig renders the figure anyway
+        plt.draw()
+    return
@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ir_plot.core import MAX_PLOT_POINTS, _decimate, import_and_normalize, import_irdata_from_csv, write_normalized_csv
+
+SAMPLE_DATA = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "sample_data.csv")
+
+
+def _sample_with_inserted_line(tmp_path, line, after):
+    """
+    Copy sample_data.csv with an extra line inserted after the given (0-based) line number
+    """
+    with open(SAMPLE_DATA) as f:
+        lines = f.read().split("\n")
+    lines.insert(after + 1, line)
+    filename = tmp_path / "sample_data.csv"
+    filename.write_text("\n".join(lines))
+    return str(filename)
+
+
+def test_import_irdata_from_csv_sample():
+    xydata = import_irdata_from_csv(SAMPLE_DATA)
+    assert list(xydata.columns) == ["X", "Y"]
+    assert len(xydata) == 8299  # 8298 points and the empty row before the footer
+    assert xydata["X"].iloc[0] == 499.955
+    assert np.isnan(xydata["X"].iloc[-1])
+
+
+@pytest.mark.parametrize("import_function, to_columns", [
+    (import_irdata_from_csv, lambda xydata: (xydata["X"], xydata["Y"])),
+    (import_and_normalize, lambda xy: xy),
+])
+def test_empty_line_within_data_block(tmp_path, import_function, to_columns):
+    filename = _sample_with_inserted_line(tmp_path, "", after=100)
+    expected = to_columns(import_function(SAMPLE_DATA))
+    result = to_columns(import_function(filename))
+    for expected_column, result_column in zip(expected, result):
+        np.testing.assert_array_equal(result_column, expected_column)
+
+
+def test_import_and_normalize_matches_import_irdata_from_csv():
+    xydata = import_irdata_from_csv(SAMPLE_DATA)
+    x, y = import_and_normalize(SAMPLE_DATA)
+    np.testing.assert_array_equal(x, xydata["X"])
+    np.testing.assert_array_equal(y, xydata["Y"] / xydata["Y"].max())
+    assert np.nanmax(y) == 1
+
+
+def test_import_and_normalize_empty_fields_within_data_block(tmp_path):
+    filename = _sample_with_inserted_line(tmp_path, ",", after=100)
+    x, y = import_and_normalize(filename)
+    xydata = import_irdata_from_csv(filename)
+    assert len(x) == 8300
+    assert np.isnan(x[82]) and np.isnan(y[82])  # line 101 of the file, the data starts at line 19
+    np.testing.assert_array_equal(x, xydata["X"])
+
+
+def test_write_normalized_csv_matches_to_csv(tmp_path):
+    x, y = import_and_normalize(SAMPLE_DATA)  # the last row (empty in the csv) is NaN in both columns
+    x, y = x.copy(), y.copy()
+    y[10] = np.nan  # a row with only one empty field
+    written, expected = tmp_path / "written.csv", tmp_path / "expected.csv"
+    write_normalized_csv(written, x, y)
+    pd.DataFrame({"X": x, "Y": y}).to_csv(expected, header=False, index=False)
+    assert written.read_bytes() == expected.read_bytes()
+
+
+def test_decimate_keeps_all_points_within_narrow_limits():
+    x, y = import_and_normalize(SAMPLE_DATA)
+    assert np.count_nonzero((x >= 1700) & (x <= 1800)) <= MAX_PLOT_POINTS
+    decimated_x, decimated_y = _decimate(x, y, 1800, 1700)
+    assert decimated_x is x and decimated_y is y
+
+
+def test_decimate_keeps_extrema_and_order():
+    x, y = import_and_normalize(SAMPLE_DATA)
+    decimated_x, decimated_y = _decimate(x, y, 4000, 500)
+    assert len(decimated_x) < len(x)
+    assert np.nanmin(decimated_y) == np.nanmin(y)
+    assert np.nanmax(decimated_y) == np.nanmax(y)
+    finite_x = decimated_x[~np.isnan(decimated_x)]  # the empty row before the footer is NaN
+    assert np.all(np.diff(finite_x) >= 0)  # min and max can be the same point
+
+
+def test_decimate_all_nan_bucket():
+    x = np.arange(10000, dtype=np.float64)
+    y = np.sin(x / 100)
+    y[5000:5100] = np.nan  # longer than a bucket, so at least one bucket is all NaN
+    decimated_x, decimated_y = _decimate(x, y, None, None)
+    assert len(decimated_x) < len(x)
+    assert np.nanmin(decimated_y) == np.nanmin(y)
+    assert np.nanmax(decimated_y) == np.nanmax(y)
+    assert np.all(np.diff(decimated_x) >= 0)